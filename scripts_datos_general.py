@@ -1,9 +1,75 @@
 import pandas as pd
+import atexit
+import functools
+import hashlib
+import html
 import logging
+import logging.handlers
+import os
+import queue
+import re
+import string
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Union, Optional
+from typing import Dict, List, Tuple, Union, Optional
 from datetime import datetime
 
+try:
+    import python_calamine  # noqa: F401
+    MOTOR_EXCEL = "calamine"
+except ImportError:
+    # Sin python-calamine se usa el motor por defecto de pandas (openpyxl/xlrd)
+    MOTOR_EXCEL = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+EXTENSIONES_EXCEL = ('.xls', '.xlsx', '.xlsm', '.xlsb')
+
+
+@functools.lru_cache(maxsize=1)
+def _archivos_excel_cwd() -> tuple:
+    """Busca una única vez los archivos Excel bajo el directorio actual."""
+    archivos = []
+    pendientes = ['.']
+    while pendientes:
+        directorio = pendientes.pop()
+        subdirectorios = []
+        try:
+            with os.scandir(directorio) as entradas:
+                for entrada in entradas:
+                    if entrada.is_dir(follow_symlinks=False):
+                        subdirectorios.append(entrada.path)
+                    elif entrada.name.lower().endswith(EXTENSIONES_EXCEL):
+                        archivos.append(Path(entrada.path))
+        except OSError:
+            continue
+        # Se recorren los subdirectorios en el orden en que aparecieron
+        pendientes.extend(reversed(subdirectorios))
+    return tuple(archivos)
+
+
+_LOCK_LOGGING = threading.Lock()
+
+
+def _construir_buscador_terminos(terminos: List[str]):
+    """Construye una función que indica si un texto contiene alguno de los términos."""
+    if ahocorasick is not None:
+        automata = ahocorasick.Automaton()
+        for termino in terminos:
+            automata.add_word(termino.lower(), termino)
+        automata.make_automaton()
+        return lambda texto: next(automata.iter(texto), None) is not None
+
+    # Sin pyahocorasick, una sola expresión regular compilada con todos los términos
+    patron = re.compile("|".join(re.escape(t.lower()) for t in terminos))
+    return lambda texto: patron.search(texto) is not None
+
 
 class ExcelAnalyzer:
     """
@@ -14,14 +80,167 @@ class ExcelAnalyzer:
         'monto', 'subtotal', 'iva', 'total', 'descuento',
         'impuesto', 'factura', 'precio'
     ]
+    _contiene_termino_financiero = staticmethod(
+        _construir_buscador_terminos(COLUMNAS_FINANCIERAS))
+
+    DIRECTORIO_CACHE = Path('.cache')
+    # Incrementar si cambia _preparar_columnas_financieras
+    VERSION_CACHE = 3
+
+    # Plantillas del reporte HTML; la tabla de datos se escribe entre ambas
+    _HTML_ENCABEZADO = string.Template("""
+            <!DOCTYPE html>
+            <html lang="es">
+            <head>
+                <meta charset="UTF-8">
+                <meta name="viewport" content="width=device-width, initial-scale=1.0">
+                <title>Reporte Financiero - $fecha</title>
+                <style>
+                    @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@300;400;700&display=swap');
+
+                    body {
+                        font-family: 'Roboto', sans-serif;
+                        line-height: 1.6;
+                        color: #333;
+                        margin: 0;
+                        padding: 0;
+                        background-color: #f5f5f5;
+                    }
+                    .container {
+                        max-width: 100%;
+                        margin: 0 auto;
+                        padding: 20px;
+                        background-color: #ffffff;
+                        box-shadow: 0 0 20px rgba(0, 0, 0, 0.1);
+                        overflow-x: auto;
+                    }
+                    .date {
+                        text-align: right;
+                        font-size: 0.9em;
+                        color: #777;
+                        margin-bottom: 20px;
+                    }
+                    h1 {
+                        color: #2c3e50;
+                        text-align: center;
+                        font-size: 2.5em;
+                        margin-bottom: 30px;
+                        border-bottom: 2px solid #3498db;
+                        padding-bottom: 10px;
+                    }
+                    .styled-table {
+                        width: 100%;
+                        border-collapse: collapse;
+                        margin: 25px 0;
+                        font-size: 0.9em;
+                        box-shadow: 0 0 20px rgba(0, 0, 0, 0.15);
+                    }
+                    .styled-table thead tr {
+                        background-color: #3498db;
+                        color: #ffffff;
+                        text-align: left;
+                    }
+                    .styled-table th,
+                    .styled-table td {
+                        padding: 12px 15px;
+                        white-space: nowrap;
+                    }
+                    .styled-table tbody tr {
+                        border-bottom: 1px solid #dddddd;
+                    }
+                    .styled-table tbody tr:nth-of-type(even) {
+                        background-color: #f3f3f3;
+                    }
+                    .styled-table tbody tr:last-of-type {
+                        border-bottom: 2px solid #3498db;
+                    }
+                    .financial-footer {
+                        display: flex;
+                        justify-content: space-between;
+                        margin-top: 40px;
+                        padding-top: 20px;
+                        border-top: 2px solid #eee;
+                    }
+                    .resumen-financiero {
+                        background-color: #f8f9fa;
+                        padding: 20px;
+                        border-radius: 6px;
+                        width: 48%;
+                        box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
+                    }
+                    .resumen-item {
+                        display: flex;
+                        justify-content: space-between;
+                        margin-bottom: 10px;
+                    }
+                    .total-factura {
+                        font-size: 1.2em;
+                        color: #2c3e50;
+                        padding: 20px;
+                        background-color: #e8f4f8;
+                        border-radius: 6px;
+                        width: 48%;
+                        box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
+                        display: flex;
+                        justify-content: space-between;
+                        align-items: center;
+                    }
+                    .total-factura strong {
+                        font-size: 1.5em;
+                        color: #3498db;
+                    }
+                    footer {
+                        margin-top: 40px;
+                        text-align: center;
+                        font-size: 0.8em;
+                        color: #777;
+                    }
+                </style>
+            </head>
+            <body>
+                <div class="container">
+                    <div class="date">
+                        $fecha
+                    </div>
+                    <h1>Reporte Financiero Detallado</h1>
+
+                    <div style="overflow-x: auto;">
+            """)
+    _HTML_PIE = string.Template("""
+                    </div>
 
-    def __init__(self, archivo_excel: Union[str, Path], configuracion: Optional[Dict] = None):
+                    <div class="financial-footer">
+                        <div class="resumen-financiero">
+                            <h3>Resumen Financiero</h3>
+                            $resumen
+                        </div>
+                        <div class="total-factura">
+                            <span>Total Factura:</span>
+                            <strong>$$$total</strong>
+                        </div>
+                    </div>
+
+                    <footer>
+                        <p>Generado por: $autor</p>
+                    </footer>
+                </div>
+            </body>
+            </html>
+            """)
+
+    def __init__(self, archivo_excel: Union[str, Path], configuracion: Optional[Dict] = None,
+                 sin_cache: bool = False, solo_monetarias: bool = False,
+                 hoja: Optional[Union[int, str]] = None):
         self.logger = None
         self.df = None
         self.directorio_salida = None
         self.columnas_monetarias = []
         self.columnas_no_monetarias = []
+        self._columnas_iva: Dict[str, bool] = {}
         self.configuracion = configuracion or {}
+        self.sin_cache = sin_cache
+        self.solo_monetarias = solo_monetarias
+        self.hoja = hoja
 
         self._configurar_logging()
         self.archivo_excel = self._validar_archivo(archivo_excel)
@@ -39,16 +258,28 @@ class ExcelAnalyzer:
         self.logger = logging.getLogger('ExcelAnalyzer')
         self.logger.setLevel(logging.INFO)
 
-        if not self.logger.handlers:
-            formatter = logging.Formatter(
-                '%(asctime)s - %(levelname)s - %(message)s')
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
-
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(formatter)
-            self.logger.addHandler(console_handler)
+        # Varios analizadores pueden crearse a la vez desde generar_reportes
+        with _LOCK_LOGGING:
+            if not self.logger.handlers:
+                self._agregar_handlers_logging(log_file)
+
+    def _agregar_handlers_logging(self, log_file: Path) -> None:
+        """Agrega al logger los handlers de archivo y consola a través de una cola."""
+        formatter = logging.Formatter(
+            '%(asctime)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(formatter)
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+
+        # La escritura a archivo y consola ocurre en un hilo aparte
+        cola_logging = queue.Queue(-1)
+        self.logger.addHandler(logging.handlers.QueueHandler(cola_logging))
+        listener = logging.handlers.QueueListener(
+            cola_logging, file_handler, console_handler)
+        listener.start()
+        atexit.register(listener.stop)
 
     def _validar_archivo(self, archivo_excel: Union[str, Path]) -> Path:
         """Valida la existencia del archivo Excel y lo retorna como Path."""
@@ -57,9 +288,14 @@ class ExcelAnalyzer:
             if archivo_path.is_file():
                 return archivo_path
 
+            # Un Path explícito no se interpreta como número ni se busca recursivamente
+            if isinstance(archivo_excel, Path):
+                raise FileNotFoundError(
+                    f"No se encontró el archivo Excel: {archivo_excel}")
+
             if archivo_excel.isdigit():
                 num = int(archivo_excel)
-                archivos_excel = list(Path().glob("**/*.xls*"))
+                archivos_excel = _archivos_excel_cwd()
                 if 1 <= num <= len(archivos_excel):
                     return archivos_excel[num - 1]
 
@@ -92,7 +328,7 @@ class ExcelAnalyzer:
     def _mostrar_archivos_disponibles(self) -> None:
         """Muestra los archivos Excel disponibles en el directorio."""
         print("\nArchivos Excel disponibles en el directorio:")
-        archivos_excel = list(Path().glob("**/*.xls*"))
+        archivos_excel = _archivos_excel_cwd()
 
         if not archivos_excel:
             print("No se encontraron archivos Excel en el directorio.")
@@ -103,40 +339,137 @@ class ExcelAnalyzer:
     def _cargar_archivo(self) -> pd.DataFrame:
         """Carga el archivo Excel permitiendo selección de hoja."""
         try:
-            xls = pd.ExcelFile(self.archivo_excel)
-            self._mostrar_hojas_disponibles(xls.sheet_names)
-
-            while True:
-                try:
-                    seleccion = int(
-                        input("Seleccione el número de la hoja a analizar: ")) - 1
-                    if 0 <= seleccion < len(xls.sheet_names):
-                        break
-                    print("Selección no válida. Intente de nuevo.")
-                except ValueError:
-                    print("Por favor, ingrese un número válido.")
-
-            hoja_seleccionada = xls.sheet_names[seleccion]
-            df = pd.read_excel(xls, sheet_name=hoja_seleccionada)
+            # El libro se abre una sola vez: para listar las hojas y para leer la elegida
+            libro = pd.ExcelFile(self.archivo_excel, engine=MOTOR_EXCEL)
+            hojas = libro.sheet_names
+
+            try:
+                if self.hoja is not None:
+                    hoja_seleccionada = self._resolver_hoja(hojas)
+                else:
+                    self._mostrar_hojas_disponibles(hojas)
+
+                    while True:
+                        try:
+                            seleccion = int(
+                                input("Seleccione el número de la hoja a analizar: ")) - 1
+                            if 0 <= seleccion < len(hojas):
+                                break
+                            print("Selección no válida. Intente de nuevo.")
+                        except ValueError:
+                            print("Por favor, ingrese un número válido.")
+
+                    hoja_seleccionada = hojas[seleccion]
+                ruta_cache = self._ruta_cache(hoja_seleccionada)
+                # Se decide una sola vez: otro analizador podría escribir el caché mientras tanto
+                df = self._leer_cache(ruta_cache)
+                desde_cache = df is not None
+                if not desde_cache:
+                    df = self._leer_hoja_pandas(libro, hoja_seleccionada)
+            finally:
+                libro.close()
             self._mostrar_info_columnas(df)
 
-            # Imprimir información de depuración
-            self.logger.info(f"Tipos de datos de las columnas:\n{df.dtypes}")
-            self.logger.info(f"Primeras filas del DataFrame:\n{df.head()}")
-
-            return self._preparar_columnas_financieras(df)
+            # Imprimir información de depuración; con el nivel INFO por defecto
+            # el DataFrame no se convierte a texto
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Tipos de datos de las columnas:\n%s", df.dtypes)
+                self.logger.debug("Primeras filas del DataFrame:\n%s", df.head())
+
+            if desde_cache:
+                # El caché ya guarda las columnas monetarias convertidas
+                self.columnas_monetarias = [
+                    col for col in df.columns if self._es_columna_monetaria(col)]
+                return df
+
+            df = self._preparar_columnas_financieras(df)
+            if ruta_cache is not None:
+                self._guardar_cache(df, ruta_cache)
+            return df
         except Exception as e:
             self.logger.error(f"Error al leer el archivo Excel: {str(e)}")
             self.logger.error(f"Detalles del error:", exc_info=True)
             raise
 
+    def _resolver_hoja(self, hojas: List[str]) -> str:
+        """Retorna la hoja indicada en el constructor, por índice (desde 0) o por nombre."""
+        if isinstance(self.hoja, int):
+            if 0 <= self.hoja < len(hojas):
+                return hojas[self.hoja]
+        elif self.hoja in hojas:
+            return self.hoja
+        raise ValueError(
+            f"La hoja {self.hoja!r} no existe en el archivo {self.archivo_excel}")
+
+    def _ruta_cache(self, hoja: str) -> Optional[Path]:
+        """Retorna la ruta del caché parquet de la hoja, según el contenido del archivo."""
+        if self.sin_cache:
+            return None
+
+        with open(self.archivo_excel, 'rb') as f:
+            digest = hashlib.file_digest(
+                f, lambda: hashlib.blake2b(digest_size=16))
+        digest.update(str(hoja).encode('utf-8'))
+        if self.solo_monetarias:
+            digest.update(b'|solo_monetarias')
+        # Las reglas de conversión forman parte de la clave: el caché guarda la hoja ya preparada
+        digest.update(f"|v{self.VERSION_CACHE}|{self.COLUMNAS_FINANCIERAS}".encode('utf-8'))
+        return self.DIRECTORIO_CACHE / f"{digest.hexdigest()}.parquet"
+
+    def _leer_cache(self, ruta_cache: Optional[Path]) -> Optional[pd.DataFrame]:
+        """Lee la hoja desde el caché parquet; retorna None si no existe o está dañado."""
+        if ruta_cache is None or not ruta_cache.is_file():
+            return None
+
+        self.logger.info(f"Cargando hoja desde caché: {ruta_cache}")
+        try:
+            return pd.read_parquet(ruta_cache)
+        except Exception as e:
+            # Una entrada dañada se descarta y la hoja se vuelve a leer del Excel
+            self.logger.warning(f"Caché inválido, se descarta: {str(e)}")
+            ruta_cache.unlink(missing_ok=True)
+            return None
+
+    def _guardar_cache(self, df: pd.DataFrame, ruta_cache: Path) -> None:
+        """Guarda el DataFrame ya preparado en el caché parquet."""
+        ruta_temporal = None
+        try:
+            ruta_cache.parent.mkdir(exist_ok=True)
+            # Se escribe a un archivo temporal y se reemplaza de forma atómica,
+            # así ningún lector ve una entrada a medio escribir
+            descriptor, nombre_temporal = tempfile.mkstemp(
+                dir=ruta_cache.parent, suffix='.tmp')
+            os.close(descriptor)
+            ruta_temporal = Path(nombre_temporal)
+            df.to_parquet(ruta_temporal)
+            os.replace(ruta_temporal, ruta_cache)
+        except Exception as e:
+            # Sin pyarrow o con columnas de tipos mixtos simplemente no se cachea
+            if ruta_temporal is not None:
+                ruta_temporal.unlink(missing_ok=True)
+            self.logger.warning(f"No se pudo guardar el caché: {str(e)}")
+
+    def _leer_hoja_pandas(self, xls: pd.ExcelFile, hoja: str) -> pd.DataFrame:
+        """Lee una hoja con pandas, conservando sólo las monetarias si así se pidió."""
+        # Una sola lectura: ni nrows=0 ni usecols evitan que el motor procese la hoja
+        df = pd.read_excel(xls, sheet_name=hoja, engine=MOTOR_EXCEL)
+        if self.solo_monetarias:
+            df = df.drop(columns=[col for col in df.columns
+                                  if not self._es_columna_monetaria(col)])
+        return df
+
+    def _es_columna_monetaria(self, columna) -> bool:
+        """Indica si el nombre de la columna corresponde a un concepto financiero."""
+        # Verificar si la columna es una cadena
+        return isinstance(columna, str) and self._contiene_termino_financiero(columna.lower())
+
     def _preparar_columnas_financieras(self, df: pd.DataFrame) -> pd.DataFrame:
         """Prepara las columnas financieras del DataFrame."""
-        for columna in df.columns:
-            columna_lower = columna.lower()
-            if any(termino in columna_lower for termino in self.COLUMNAS_FINANCIERAS):
-                df[columna] = pd.to_numeric(df[columna], errors='coerce')
-                df[columna] = df[columna].fillna(0)
+        self.columnas_monetarias = [
+            col for col in df.columns if self._es_columna_monetaria(col)]
+        if self.columnas_monetarias:
+            df[self.columnas_monetarias] = df[self.columnas_monetarias].apply(
+                pd.to_numeric, errors='coerce').fillna(0)
         return df
 
     def _mostrar_hojas_disponibles(self, hojas: List[str]) -> None:
@@ -158,24 +491,15 @@ class ExcelAnalyzer:
         self.logger.info(f"Directorio de salida creado: {
                          self.directorio_salida}")
 
-    def _preparar_columnas_financieras(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Prepara las columnas financieras del DataFrame."""
-        for columna in df.columns:
-            if isinstance(columna, str):  # Verificar si la columna es una cadena
-                columna_lower = columna.lower()
-                if any(termino in columna_lower for termino in self.COLUMNAS_FINANCIERAS):
-                    df[columna] = pd.to_numeric(df[columna], errors='coerce')
-                    df[columna] = df[columna].fillna(0)
-        return df
-
     def _identificar_columnas(self) -> None:
         """Identifica y clasifica las columnas del DataFrame."""
-        self.columnas_monetarias = [col for col in self.df.columns if
-                                    # Verificar si la columna es una cadena
-                                    isinstance(col, str) and
-                                    any(termino in col.lower() for termino in self.COLUMNAS_FINANCIERAS)]
+        # Las columnas monetarias ya se calcularon en _preparar_columnas_financieras
+        monetarias = set(self.columnas_monetarias)
         self.columnas_no_monetarias = [
-            col for col in self.df.columns if col not in self.columnas_monetarias]
+            col for col in self.df.columns if col not in monetarias]
+        # Clasificación de IVA calculada una sola vez para calcular_totales_financieros
+        self._columnas_iva = {
+            col: 'iva' in col.lower() for col in self.columnas_monetarias}
 
         self.logger.info(f"Columnas monetarias identificadas: {
                          self.columnas_monetarias}")
@@ -184,182 +508,129 @@ class ExcelAnalyzer:
 
     def calcular_totales_financieros(self) -> Dict[str, float]:
         """Calcula los totales financieros del DataFrame de manera adaptable."""
+        # Una sola reducción sobre todas las columnas monetarias
+        sumas = self.df[self.columnas_monetarias].sum()
+
+        # Cálculo de IVA configurable
+        calcular_iva = bool(self.configuracion.get('calcular_iva', True))
+        aplica_iva = ~sumas.index.map(self._columnas_iva).to_numpy(dtype=bool) & calcular_iva
+        iva_rate = self.configuracion.get('iva_rate', 0.16)
+        ivas = sumas.where(aplica_iva, 0) * iva_rate
+        con_iva = sumas + ivas
+
         totales = {}
-        for columna in self.columnas_monetarias:
-            total_columna = self.df[columna].sum()
+        # El total de factura se acumula en la misma pasada
+        total_factura = 0.0
+        for columna, total_columna, iva, total_con_iva, con_calculo in zip(
+                sumas.index, sumas, ivas, con_iva, aplica_iva):
             totales[f'Total {columna}'] = total_columna
-
-            # Cálculo de IVA configurable
-            if self.configuracion.get('calcular_iva', True) and 'iva' not in columna.lower():
-                iva_rate = self.configuracion.get('iva_rate', 0.16)
-                iva = total_columna * iva_rate
+            if con_calculo:
                 totales[f'IVA de {columna}'] = iva
-                totales[f'Total con IVA de {columna}'] = total_columna + iva
+                totales[f'Total con IVA de {columna}'] = total_con_iva
+                total_factura += total_con_iva
 
-        # Cálculo del total de factura
-        totales['Total Factura'] = sum(
-            valor for clave, valor in totales.items() if 'Total con IVA' in clave)
+        totales['Total Factura'] = total_factura
 
         return totales
 
-    def generar_reporte_html(self) -> Path:
-        """Genera un reporte HTML con análisis financiero detallado en formato profesional."""
+    @staticmethod
+    def _formatear_columna_html(serie: pd.Series, monetaria: bool) -> pd.Series:
+        """Convierte una columna a las cadenas que se muestran en la tabla HTML."""
+        if monetaria:
+            return serie.map("${:,.2f}".format)
+
+        faltantes = serie.isna()
+        if pd.api.types.is_float_dtype(serie):
+            # Igual que el float_format que se usaba con to_html para los valores float
+            return serie.map("${:,.2f}".format).where(~faltantes, 'NaN')
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            return serie.astype(str).where(~faltantes, 'NaT')
+        if serie.dtype == object:
+            # Columnas mixtas: se formatea cada valor según su tipo, como to_html
+            return serie.map(ExcelAnalyzer._formatear_valor_html)
+
+        texto = serie.astype(str).where(~faltantes, 'NaN')
+        if pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+            # Números y booleanos no contienen caracteres especiales de HTML
+            return texto
+        return texto.map(html.escape)
+
+    @staticmethod
+    def _formatear_valor_html(valor) -> str:
+        """Formatea un valor de una columna de objetos para la tabla HTML."""
+        if valor is None:
+            return 'None'
+        if isinstance(valor, float):
+            return 'NaN' if valor != valor else f"${valor:,.2f}"
+        return html.escape(str(valor))
+
+    def _identificador_archivo(self) -> str:
+        """Retorna un identificador del archivo Excel único por ruta, para nombrar el reporte."""
+        # El resumen de la ruta resuelta distingue sub1/limpio.xlsx de sub2/limpio.xlsx
+        resumen = hashlib.blake2b(
+            str(self.archivo_excel.resolve()).encode('utf-8'), digest_size=4).hexdigest()
+        return f"{self.archivo_excel.stem}_{resumen}"
+
+    def _escribir_tabla_html(self, archivo, filas_por_bloque: int = 10000) -> None:
+        """Escribe la tabla de datos en el archivo HTML binario sin construir todo el HTML en memoria."""
+        monetarias = set(self.columnas_monetarias)
+        archivo.write(b'<table border="1" class="dataframe styled-table">\n'
+                      b'  <thead>\n    <tr style="text-align: right;">\n')
+        archivo.write(''.join(f"      <th>{html.escape(str(col))}</th>\n"
+                              for col in self.df.columns).encode('utf-8'))
+        archivo.write(b'    </tr>\n  </thead>\n  <tbody>\n')
+
+        # Formateo vectorizado de cada columna completa, como to_html: el formato de
+        # las fechas depende de todos los valores de la columna, no de un bloque
+        celdas = pd.DataFrame({
+            i: self._formatear_columna_html(serie, col in monetarias)
+            for i, (col, serie) in enumerate(self.df.items())
+        })
+        for inicio in range(0, len(celdas), filas_por_bloque):
+            bloque = celdas.iloc[inicio:inicio + filas_por_bloque]
+            # Cada bloque se codifica una sola vez antes de escribirlo
+            archivo.write(''.join(
+                '    <tr>\n      <td>' + '</td>\n      <td>'.join(fila) +
+                '</td>\n    </tr>\n'
+                for fila in bloque.itertuples(index=False, name=None)).encode('utf-8'))
+
+        archivo.write(b'  </tbody>\n</table>\n')
+
+    def generar_reporte_html(self, nombre_por_archivo: bool = False) -> Path:
+        """
+        Genera un reporte HTML con análisis financiero detallado en formato profesional.
+
+        Con nombre_por_archivo=True el nombre del reporte incluye un identificador
+        del archivo de origen, para que varios reportes del mismo día no se pisen.
+        """
         try:
             totales_financieros = self.calcular_totales_financieros()
 
-            # Preparar los datos de la tabla principal
-            tabla_datos = self.df.to_html(classes='styled-table', index=False,
-                                          float_format=lambda x: f"${x:,.2f}" if isinstance(x, (int, float)) else x)
-
             # Preparar el resumen financiero en formato texto
-            resumen_financiero = ""
-            for concepto, valor in totales_financieros.items():
-                if concepto != 'Total Factura':  # Excluimos el total de la factura del resumen
-                    resumen_financiero += f"<div class='resumen-item'><span>{
-                        concepto}:</span> <strong>${valor:,.2f}</strong></div>"
-
-            html_content = f"""
-            <!DOCTYPE html>
-            <html lang="es">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>Reporte Financiero - {self.reporte_fecha}</title>
-                <style>
-                    @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@300;400;700&display=swap');
-
-                    body {{
-                        font-family: 'Roboto', sans-serif;
-                        line-height: 1.6;
-                        color: #333;
-                        margin: 0;
-                        padding: 0;
-                        background-color: #f5f5f5;
-                    }}
-                    .container {{
-                        max-width: 100%;
-                        margin: 0 auto;
-                        padding: 20px;
-                        background-color: #ffffff;
-                        box-shadow: 0 0 20px rgba(0, 0, 0, 0.1);
-                        overflow-x: auto;
-                    }}
-                    .date {{
-                        text-align: right;
-                        font-size: 0.9em;
-                        color: #777;
-                        margin-bottom: 20px;
-                    }}
-                    h1 {{
-                        color: #2c3e50;
-                        text-align: center;
-                        font-size: 2.5em;
-                        margin-bottom: 30px;
-                        border-bottom: 2px solid #3498db;
-                        padding-bottom: 10px;
-                    }}
-                    .styled-table {{
-                        width: 100%;
-                        border-collapse: collapse;
-                        margin: 25px 0;
-                        font-size: 0.9em;
-                        box-shadow: 0 0 20px rgba(0, 0, 0, 0.15);
-                    }}
-                    .styled-table thead tr {{
-                        background-color: #3498db;
-                        color: #ffffff;
-                        text-align: left;
-                    }}
-                    .styled-table th,
-                    .styled-table td {{
-                        padding: 12px 15px;
-                        white-space: nowrap;
-                    }}
-                    .styled-table tbody tr {{
-                        border-bottom: 1px solid #dddddd;
-                    }}
-                    .styled-table tbody tr:nth-of-type(even) {{
-                        background-color: #f3f3f3;
-                    }}
-                    .styled-table tbody tr:last-of-type {{
-                        border-bottom: 2px solid #3498db;
-                    }}
-                    .financial-footer {{
-                        display: flex;
-                        justify-content: space-between;
-                        margin-top: 40px;
-                        padding-top: 20px;
-                        border-top: 2px solid #eee;
-                    }}
-                    .resumen-financiero {{
-                        background-color: #f8f9fa;
-                        padding: 20px;
-                        border-radius: 6px;
-                        width: 48%;
-                        box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
-                    }}
-                    .resumen-item {{
-                        display: flex;
-                        justify-content: space-between;
-                        margin-bottom: 10px;
-                    }}
-                    .total-factura {{
-                        font-size: 1.2em;
-                        color: #2c3e50;
-                        padding: 20px;
-                        background-color: #e8f4f8;
-                        border-radius: 6px;
-                        width: 48%;
-                        box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
-                        display: flex;
-                        justify-content: space-between;
-                        align-items: center;
-                    }}
-                    .total-factura strong {{
-                        font-size: 1.5em;
-                        color: #3498db;
-                    }}
-                    footer {{
-                        margin-top: 40px;
-                        text-align: center;
-                        font-size: 0.8em;
-                        color: #777;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="date">
-                        {self.reporte_fecha}
-                    </div>
-                    <h1>Reporte Financiero Detallado</h1>
-
-                    <div style="overflow-x: auto;">
-                        {tabla_datos}
-                    </div>
-
-                    <div class="financial-footer">
-                        <div class="resumen-financiero">
-                            <h3>Resumen Financiero</h3>
-                            {resumen_financiero}
-                        </div>
-                        <div class="total-factura">
-                            <span>Total Factura:</span>
-                            <strong>${totales_financieros['Total Factura']:,.2f}</strong>
-                        </div>
-                    </div>
-
-                    <footer>
-                        <p>Generado por: {self.AUTOR}</p>
-                    </footer>
-                </div>
-            </body>
-            </html>
-            """
-
-            nombre_archivo = self.directorio_salida / \
-                f'reporte_financiero_{self.reporte_fecha}.html'
-            nombre_archivo.write_text(html_content, encoding='utf-8')
+            resumen_financiero = "".join(
+                f"<div class='resumen-item'><span>{
+                    concepto}:</span> <strong>${valor:,.2f}</strong></div>"
+                for concepto, valor in totales_financieros.items()
+                if concepto != 'Total Factura')  # Excluimos el total de la factura del resumen
+
+            html_encabezado = self._HTML_ENCABEZADO.substitute(
+                fecha=self.reporte_fecha)
+            html_pie = self._HTML_PIE.substitute(
+                resumen=resumen_financiero,
+                total=f"{totales_financieros['Total Factura']:,.2f}",
+                autor=self.AUTOR)
+
+            if nombre_por_archivo:
+                nombre_archivo = self.directorio_salida / \
+                    f'reporte_financiero_{self._identificador_archivo()}_{self.reporte_fecha}.html'
+            else:
+                nombre_archivo = self.directorio_salida / \
+                    f'reporte_financiero_{self.reporte_fecha}.html'
+            # La tabla principal se escribe por bloques directamente en el archivo
+            with open(nombre_archivo, 'wb', buffering=1 << 20) as archivo:
+                archivo.write(html_encabezado.encode('utf-8'))
+                self._escribir_tabla_html(archivo)
+                archivo.write(html_pie.encode('utf-8'))
 
             self.logger.info(f"Reporte HTML generado: {nombre_archivo}")
             return nombre_archivo
@@ -369,25 +640,76 @@ class ExcelAnalyzer:
             raise
 
 
+def generar_reportes(archivos_excel: List[Union[str, Path]], hoja: Union[int, str] = 0,
+                     configuracion: Optional[Dict] = None,
+                     max_workers: Optional[int] = None
+                     ) -> Tuple[Dict[Path, Path], Dict[Path, Exception]]:
+    """
+    Genera en paralelo, sin interacción, los reportes HTML de varios archivos Excel.
+
+    Retorna los reportes generados y los errores, ambos por archivo de origen;
+    un archivo con error no detiene el resto del lote.
+    """
+    def generar(archivo: Path) -> Path:
+        analizador = ExcelAnalyzer(archivo, configuracion, hoja=hoja)
+        return analizador.generar_reporte_html(nombre_por_archivo=True)
+
+    # Un mismo archivo listado dos veces escribiría el mismo reporte a la vez
+    unicos = {}
+    for archivo in archivos_excel:
+        unicos.setdefault(Path(archivo).resolve(), Path(archivo))
+    orden = list(unicos.values())
+
+    reportes = {}
+    errores = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futuros = {executor.submit(generar, archivo): archivo for archivo in orden}
+        for futuro in as_completed(futuros):
+            archivo = futuros[futuro]
+            try:
+                reportes[archivo] = futuro.result()
+            except Exception as e:
+                errores[archivo] = e
+
+    # Se conserva el orden de la lista de entrada
+    return ({a: reportes[a] for a in orden if a in reportes},
+            {a: errores[a] for a in orden if a in errores})
+
+
 def main():
     print("="*50)
     print(f"Analizador de Datos Excel - {ExcelAnalyzer.AUTOR}")
     print("="*50)
 
     try:
-        archivos_excel = list(Path().glob("**/*.xls*"))
+        archivos_excel = _archivos_excel_cwd()
 
         if archivos_excel:
             print("\nArchivos Excel encontrados:")
             for i, archivo in enumerate(archivos_excel, 1):
                 print(f"{i}. {archivo}")
             print("\nPuede escribir el nombre del archivo o su número de la lista.")
+            print("Escriba 'todos' para analizar la primera hoja de todos los archivos.")
         else:
             print("No se encontraron archivos Excel en el directorio actual.")
 
         archivo_excel = input(
             "\nIngrese el nombre o número del archivo Excel a analizar: ").strip()
 
+        if archivos_excel and archivo_excel.lower() == 'todos':
+            reportes, errores = generar_reportes(archivos_excel)
+
+            if reportes:
+                print("\n¡Análisis completado exitosamente!")
+            for archivo, reporte in reportes.items():
+                print(f"Reporte de {archivo} guardado en: {reporte}")
+            for archivo, error in errores.items():
+                print(f"\nError al analizar {archivo}: {str(error)}")
+            if errores:
+                print("Consulte el archivo de log para más detalles.")
+            print("\nDesarrollado por: Michael Haring García")
+            return
+
         analizador = ExcelAnalyzer(archivo_excel)
         print("Columnas del DataFrame:",
               analizador.df.columns.tolist())  # Depuración